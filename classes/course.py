@@ -20,6 +20,12 @@ class Course:
         layer_assigned (int|None): assigned scheduling layer or None.
         is_celebrity (bool): whether this course was fixed by celebrity CSV.
     """
+    __slots__ = (
+        "name", "part_of_chain", "min_layer", "prereqs", "possible_teachers",
+        "module_assigned", "teacher_assigned", "layer_assigned", "is_celebrity",
+        "_teacher_objs", "_teacher_order", "_min_abs_slot",
+    )
+
     def __init__(self, name):
         self.name = name
 
@@ -37,6 +43,15 @@ class Course:
         self.layer_assigned = None
         self.is_celebrity = False
 
+        # earliest absolute slot (layer * 14 + module) allowed by assigned
+        # prereqs; kept up to date by the Scheduler as prereqs are placed
+        self._min_abs_slot = 0
+
+        # resolved Teacher objects and module -> teachers ranked by static
+        # preference; both built lazily once teachers are loaded
+        self._teacher_objs = None
+        self._teacher_order = {}
+
     # ---------- prereq helpers ----------
 
     def all_prereqs_assigned(self, courses):
@@ -75,19 +90,87 @@ class Course:
 
     # ---------- teacher helpers ----------
 
+    def _get_teacher_objs(self, teachers):
+        """Return the Teacher objects for `possible_teachers`, resolved once.
+
+        Raises:
+            KeyError: if a possible teacher is missing from `teachers`.
+        """
+        if self._teacher_objs is None:
+            objs = []
+            for teacher_name in self.possible_teachers:
+                teacher = teachers.get(teacher_name)
+                if teacher is None:
+                    raise KeyError(
+                        f"Teacher '{teacher_name}' missing for course '{self.name}'"
+                    )
+                objs.append(teacher)
+            self._teacher_objs = objs
+        return self._teacher_objs
+
     def has_teachers_for_module(self, module, teachers, strict=False):
         """Return True if any possible teacher can teach this course in the module.
 
         This performs a lightweight availability check using Teacher.is_available_for.
         """
-        for teacher_name in self.possible_teachers:
-            teacher = teachers.get(teacher_name)
-
+        for teacher in self._get_teacher_objs(teachers):
             if teacher.is_available_for(self.name, module, strict=strict):
                 return True
 
         return False
 
+    def count_teachers_for_module(self, module, teachers, strict=False, limit=None):
+        """Return how many possible teachers can teach this course in the module.
+
+        Counting stops as soon as the count exceeds `limit` (when given), for
+        callers that only need to know the course cannot beat that count.
+        """
+        cnt = 0
+        for teacher in self._get_teacher_objs(teachers):
+            if teacher.is_available_for(self.name, module, strict=strict):
+                cnt += 1
+                if limit is not None and cnt > limit:
+                    break
+        return cnt
+
+    def available_modules_mask(self, teachers, strict=False):
+        """Return a 14-bit mask of modules where some possible teacher is available.
+
+        Bit (m-1) is set exactly when `has_teachers_for_module(m, ...)` is True.
+        """
+        mask = 0
+        for teacher in self._get_teacher_objs(teachers):
+            mask |= teacher.available_modules_mask(self.name, strict=strict)
+        return mask
+
+
+    def _get_teacher_order(self, module, teachers):
+        """Return possible teachers for `module` ranked by the static criteria.
+
+        Availability and teachable courses do not change while scheduling, so
+        the ranking by (availability_score, specialization, name) is computed
+        once per module. Teachers forbidden in the module are left out.
+
+        Returns a list of ((availability_score, specialization), teacher_name).
+        """
+        order = self._teacher_order.get(module)
+        if order is not None:
+            return order
+
+        ranked = []
+        for teacher in self._get_teacher_objs(teachers):
+            if teacher.availability_value(module) == -1:
+                continue
+            ranked.append((
+                teacher.availability_score(module),
+                len(teacher.can_teach_courses),
+                teacher.name,
+            ))
+        ranked.sort()
+
+        order = [((score, specialization), name) for score, specialization, name in ranked]
+        self._teacher_order[module] = order
+        return order
 
     def get_teacher_for_module(self, module, teachers, strict=False):
         """Choose the best available teacher for this course in the module.
@@ -96,29 +179,27 @@ class Course:
           1) availability_score (declared availability preferred)
           2) specialization (fewer courses means more specialized)
           3) capacity left (prefer teachers with more remaining capacity)
+          4) teacher name (stable)
 
         Returns selected teacher name or None if none are available.
         """
-        available = []
+        best = None
+        best_key = None
 
-        for teacher_name in self.possible_teachers:
-            teacher = teachers.get(teacher_name)
-            if teacher is None:
-                raise KeyError(
-                    f"Teacher '{teacher_name}' missing for course '{self.name}'"
-                )
+        for static_key, teacher_name in self._get_teacher_order(module, teachers):
+            # only capacity varies within a group; a worse group cannot win
+            if best is not None and static_key != best_key:
+                break
 
-            if teacher.is_available_for(self.name, module, strict=strict):
-                specialization = len(teacher.can_teach_courses)
-                capacity_left = teacher.capacity_left
-                availability_score = teacher.availability_score(module)
-                available.append((teacher_name, availability_score, specialization, capacity_left))
+            teacher = teachers[teacher_name]
+            if not teacher.is_available_for(self.name, module, strict=strict):
+                continue
 
-        if not available:
-            return None
+            if best is None or teacher.capacity_left > best.capacity_left:
+                best = teacher
+                best_key = static_key
 
-        best = min(available, key=lambda t: (t[1], t[2], -t[3]))
-        return best[0]
+        return best.name if best is not None else None
 
 
     # ---------- assignment ----------
@@ -130,6 +211,7 @@ class Course:
           - not already assigned
           - layer meets min_layer
           - all prereqs are assigned and scheduled before this slot
+            (via `_min_abs_slot`)
           - at least one teacher is available for the slot
         """
         if self.module_assigned is not None:
@@ -141,18 +223,8 @@ class Course:
         if not self.all_prereqs_assigned(courses):
             return False
 
-        absolute_current = layer * 14 + module
-
-        for prereq_name in self.prereqs:
-            prereq = courses[prereq_name]
-
-            if prereq.layer_assigned is None:
-                return False
-
-            absolute_prereq = prereq.layer_assigned * 14 + prereq.module_assigned
-
-            if absolute_current <= absolute_prereq:
-                return False
+        if layer * 14 + module < self._min_abs_slot:
+            return False
 
         if not self.has_teachers_for_module(module, teachers, strict=strict):
             return False
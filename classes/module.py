@@ -12,15 +12,23 @@ class Module:
         number (int): module index (1..14)
         max_capacity (int): maximum number of courses allowed in this module
         courses (list[Course]): courses currently placed in this module
-        chain_layers (dict[int,int]): counts of chain courses per layer
+        chain_bits (int): chain course counts per layer packed as 4-bit nibbles
+            (layer L occupies bits 4L..4L+3)
+        chain_count_total (int): number of chain courses across all layers
         has_celebrity_course (bool): True if a celebrity course was placed here
     """
+    __slots__ = (
+        "number", "max_capacity", "courses",
+        "chain_bits", "chain_count_total", "has_celebrity_course",
+    )
+
     def __init__(self, number, max_capacity=9):
         self.number = number
         self.max_capacity = max_capacity
 
         self.courses = []              # list of Course objects
-        self.chain_layers = {}         # layer -> count of chain courses
+        self.chain_bits = 0            # packed layer -> count of chain courses
+        self.chain_count_total = 0     # chain courses in any layer
         self.has_celebrity_course = False
 
     # ---------- basic state ----------
@@ -31,7 +39,20 @@ class Module:
 
     def chain_count_in_layer(self, layer):
         """Return how many chain courses are scheduled in the given layer for this module."""
-        return self.chain_layers.get(layer, 0)
+        return (self.chain_bits >> (layer << 2)) & 0xF
+
+    @property
+    def chain_layers(self):
+        """Decoded view of `chain_bits`: dict layer -> count (non-zero layers only)."""
+        layers = {}
+        bits = self.chain_bits
+        layer = 0
+        while bits:
+            if bits & 0xF:
+                layers[layer] = bits & 0xF
+            bits >>= 4
+            layer += 1
+        return layers
 
     # ---------- constraint checks ----------
 
@@ -59,7 +80,7 @@ class Module:
             if self.has_celebrity_course:
                 return False
 
-            if any(c.part_of_chain for c in self.courses):
+            if self.chain_count_total > 0:
                 return False
 
         return True
@@ -71,12 +92,18 @@ class Module:
         Assumes can_accept() was already validated.
         """
 
+        # a layer's count is a 4-bit nibble; refuse to overflow into the next layer
+        if course.part_of_chain and self.chain_count_in_layer(layer) == 0xF:
+            raise ValueError(
+                f"Module {self.number} holds too many chain courses in layer {layer}."
+            )
+
         if is_celebrity:
             if self.has_celebrity_course:
                 raise ValueError(
                     f"Module {self.number} already has a celebrity course."
                 )
-            if any(c.part_of_chain for c in self.courses):
+            if self.chain_count_total > 0:
                 raise ValueError(
                     f"Cannot add celebrity course '{course.name}' "
                     f"to module {self.number} after chain courses."
@@ -86,7 +113,8 @@ class Module:
         self.courses.append(course)
 
         if course.part_of_chain:
-            self.chain_layers[layer] = self.chain_layers.get(layer, 0) + 1
+            self.chain_bits += 1 << (layer << 2)
+            self.chain_count_total += 1
 
     def __repr__(self):
         return (
@@ -8,7 +8,20 @@ Contains the scheduling algorithm broken into three passes:
 Also includes helpers to print and export schedule summaries.
 """
 
-import csv
+import heapq
+import logging
+import sys
+from collections import namedtuple
+
+from .csv_utils import write_csv
+
+
+log = logging.getLogger(__name__)
+
+ALL_MODULES_MASK = (1 << 14) - 1   # bit (m - 1) set for every module m in 1..14
+
+# one placed course with its derived output fields (see _materialize_assignments)
+Assignment = namedtuple("Assignment", ["course", "teacher", "module", "availability"])
 
 
 class Scheduler:
@@ -24,6 +37,109 @@ class Scheduler:
         self.courses = courses      # dict: course_name -> Course
         self.modules = modules      # dict: module_number (1..14) -> Module
 
+        # prereq graph for Kahn-style readiness tracking (built once)
+        self._succ = {name: [] for name in courses}   # prereq -> dependent courses
+        self._indeg = {}                              # course -> unassigned prereq count
+        self._latest_prereq = {name: 0 for name in courses}  # highest prereq module
+
+        for course in courses.values():
+            for prereq_name in course.prereqs:
+                if prereq_name not in self._succ:
+                    raise KeyError(
+                        f"Missing prereq '{prereq_name}' for course '{course.name}'"
+                    )
+                self._succ[prereq_name].append(course.name)
+            self._indeg[course.name] = 0
+            for prereq_name in course.prereqs:
+                prereq = courses[prereq_name]
+                if prereq.module_assigned is None:
+                    self._indeg[course.name] += 1
+                else:
+                    course._min_abs_slot = max(
+                        course._min_abs_slot,
+                        (prereq.layer_assigned or 0) * 14 + prereq.module_assigned + 1,
+                    )
+                    self._latest_prereq[course.name] = max(
+                        self._latest_prereq[course.name], prereq.module_assigned
+                    )
+
+        # teacher -> courses they may teach (for scoped cache invalidation)
+        self._teacher_to_courses = {}
+        for course in courses.values():
+            for teacher_name in course.possible_teachers:
+                self._teacher_to_courses.setdefault(teacher_name, set()).add(course.name)
+
+        # module bitmasks (bit m-1 <-> module m) for O(1) chain feasibility
+        self._celebrity_module_mask = 0
+        self._full_module_mask = 0
+        self._chain_taken_mask = {}    # layer -> modules already holding a chain course
+        for mnum, mod in modules.items():
+            bit = 1 << (mnum - 1)
+            if mod.has_celebrity_course:
+                self._celebrity_module_mask |= bit
+            if mod.total_count() >= mod.max_capacity:
+                self._full_module_mask |= bit
+            for layer, count in mod.chain_layers.items():
+                if count >= 1:
+                    self._chain_taken_mask[layer] = self._chain_taken_mask.get(layer, 0) | bit
+
+        # cached output view of placed courses; reset on every assignment
+        self._assignments = None
+
+        # unassigned chain courses whose prereqs are all assigned
+        self._ready = {
+            c.name for c in courses.values()
+            if c.part_of_chain and c.module_assigned is None and self._indeg[c.name] == 0
+        }
+
+    # ---------- prereq tracking ----------
+
+    def _mark_assigned(self, course, layer):
+        """Update readiness and module-mask state after `course` was placed.
+
+        Decrements the remaining-prereq count of every dependent course, records
+        the latest prereq module and earliest allowed slot, and moves dependents
+        into the ready set once all of their prereqs are placed.
+        """
+        self._ready.discard(course.name)
+        self._assignments = None
+
+        mod = self.modules[course.module_assigned]
+        bit = 1 << (course.module_assigned - 1)
+        if mod.has_celebrity_course:
+            self._celebrity_module_mask |= bit
+        if mod.total_count() >= mod.max_capacity:
+            self._full_module_mask |= bit
+        if course.part_of_chain:
+            self._chain_taken_mask[layer] = self._chain_taken_mask.get(layer, 0) | bit
+
+        abs_slot = course.layer_assigned * 14 + course.module_assigned
+
+        for succ_name in self._succ[course.name]:
+            succ = self.courses[succ_name]
+
+            self._indeg[succ_name] -= 1
+            self._latest_prereq[succ_name] = max(
+                self._latest_prereq[succ_name], course.module_assigned
+            )
+            succ._min_abs_slot = max(succ._min_abs_slot, abs_slot + 1)
+
+            if (
+                self._indeg[succ_name] == 0
+                and succ.part_of_chain
+                and succ.module_assigned is None
+            ):
+                self._ready.add(succ_name)
+
+    def _prereq_slot_mask(self, course, layer):
+        """Return the modules of `layer` that come strictly after every prereq."""
+        too_early = course._min_abs_slot - 1 - layer * 14   # modules 1..too_early
+        if too_early <= 0:
+            return ALL_MODULES_MASK
+        if too_early >= 14:
+            return 0
+        return ALL_MODULES_MASK & ~((1 << too_early) - 1)
+
     # ---------- PASS 1: CELEBRITY COURSES ----------
 
     def pass1_celebrity(self, celebrity_courses):
@@ -73,10 +189,12 @@ class Scheduler:
                 )
 
             course.module_assigned = module_num
+            course.layer_assigned = 0
             course.teacher_assigned = teacher_name
             course.is_celebrity = True
 
             module.add_course(course, layer=0, is_celebrity=True)
+            self._mark_assigned(course, layer=0)
             assigned += 1
 
         return assigned
@@ -98,40 +216,41 @@ class Scheduler:
         Raises on deadlock (ready courses exist but none can be placed).
         """
 
-        def is_ready(course, layer):
-            if not course.part_of_chain:
-                return False
-            if course.module_assigned is not None:
-                return False
-            if layer < course.min_layer:
-                return False
-            return course.all_prereqs_assigned(self.courses)
-
-        def fits_in_module(course, module_num, layer, strict=False):
-            mod = self.modules[module_num]
-
-            # skip celebrity modules for chains
-            if mod.has_celebrity_course:
-                return False
-
-            # module-level constraints (cap + 1 chain per layer)
-            if not mod.can_accept(course, layer=layer, is_celebrity=False):
-                return False
-
-            return course.can_be_assigned_to_module(module_num, layer, self.courses, self.teachers, strict=strict)
-
-
-        def feasible_module_count(course, layer, strict=False):
-            cnt = 0
-            for m in range(1, 15):
-                if fits_in_module(course, m, layer, strict=strict):
-                    cnt += 1
-            return cnt
-
-        unassigned = [c for c in self.courses.values() if c.part_of_chain and c.module_assigned is None]
+        def feasible_mask(course, layer, strict=False):
+            # bit (m - 1) set when the course fits in module m; cached per
+            # layer-phase, see invalidation below
+            feasible = feasible_cache.get(course.name)
+            if feasible is not None:
+                return feasible
+
+            # module-level constraints: celebrity modules, capacity, 1 chain per layer
+            blocked = (
+                self._celebrity_module_mask
+                | self._full_module_mask
+                | self._chain_taken_mask.get(layer, 0)
+            )
+            candidates = ~blocked & self._prereq_slot_mask(course, layer)
+
+            # teacher state is dynamic (capacity, taken modules); the mask is
+            # already limited to modules some possible teacher has open
+            feasible = candidates & course.available_modules_mask(self.teachers, strict=strict)
+
+            feasible_cache[course.name] = feasible
+            score_cache[course.name] = (
+                feasible.bit_count(), -self._latest_prereq[course.name], course.name
+            )
+            return feasible
+
+        unassigned = {
+            c.name: c for c in self.courses.values()
+            if c.part_of_chain and c.module_assigned is None
+        }
         assigned_total = 0
         layer = 0
 
+        ready = self._ready
+        latest_prereq = self._latest_prereq
+
         while unassigned:
 
             if layer > max_layers:
@@ -139,7 +258,7 @@ class Scheduler:
                 """ raise RuntimeError(
                     f"Too many layers ({layer}) while chain courses still unassigned "
                     f"({len(unassigned)}). Likely impossible constraints. "
-                    f"Unassigned chain courses at layer {layer}: {[c.name for c in unassigned]} "
+                    f"Unassigned chain courses at layer {layer}: {list(unassigned)} "
                 ) """
 
             progress_this_layer = 0
@@ -150,6 +269,8 @@ class Scheduler:
             for strict in [True, False]:
 
                 progress_phase = 0
+                feasible_cache = {}   # course_name -> feasible module bitmask
+                score_cache = {}      # course_name -> (mc, -latest, name) rank key
 
                 for module_num in range(1, 15):
                     mod = self.modules[module_num]
@@ -162,30 +283,29 @@ class Scheduler:
                     if mod.chain_count_in_layer(layer) >= 1:
                         continue
 
-                    candidates = []
-
-                    for course in unassigned:
-
-                        if not is_ready(course, layer):
+                    # single fused scan: filter ready courses that fit this
+                    # module and keep the running best (mc, -latest, name)
+                    module_bit = 1 << (module_num - 1)
+                    best = None
+                    for name in ready:
+                        course = self.courses[name]
+                        if layer < course.min_layer:
                             continue
 
-                        if not fits_in_module(course, module_num, layer, strict):
+                        feasible = feasible_cache.get(name)
+                        if feasible is None:
+                            feasible = feasible_mask(course, layer, strict)
+                        if not feasible & module_bit:
                             continue
 
-                        # scoring
-                        mc = feasible_module_count(course, layer, strict)
-                        latest = (
-                            course.get_latest_assigned_prereq(self.courses)
-                            if course.prereqs else 0
-                        )
-
-                        candidates.append((mc, -latest, course.name, course))
+                        key = score_cache[name]
+                        if best is None or key < best[0]:
+                            best = (key, course)
 
-                    if not candidates:
+                    if best is None:
                         continue
 
-                    candidates.sort()
-                    chosen = candidates[0][3]
+                    chosen = best[1]
 
                     ok = chosen.assign_to_module(
                         module_num,
@@ -202,8 +322,24 @@ class Scheduler:
                         )
 
                     mod.add_course(chosen, layer=layer, is_celebrity=False)
-
-                    unassigned.remove(chosen)
+                    self._mark_assigned(chosen, layer=layer)
+
+                    # this module now holds this layer's chain course, and only
+                    # courses sharing the chosen teacher see other modules change.
+                    # Only entries whose mask actually changes are rescored;
+                    # latest_prereq is fixed once a course is ready.
+                    feasible_cache.pop(chosen.name, None)
+                    for name, feasible in feasible_cache.items():
+                        if feasible & module_bit:
+                            feasible &= ~module_bit
+                            feasible_cache[name] = feasible
+                            score_cache[name] = (
+                                feasible.bit_count(), -latest_prereq[name], name
+                            )
+                    for name in self._teacher_to_courses[chosen.teacher_assigned]:
+                        feasible_cache.pop(name, None)
+
+                    del unassigned[chosen.name]
 
                     assigned_total += 1
                     progress_phase += 1
@@ -221,78 +357,115 @@ class Scheduler:
                 # No strict progress and no soft progress → move to next layer
                 layer += 1
 
-        print(f"Layer reached: {layer}")
+        log.debug("Layer reached: %d", layer)
         return assigned_total
 
 
     # ---------- PASS 3 ----------
 
-    def pass3_solitary(self):
+    def pass3_solitary(self, skip_unplaceable=False):
         """
         PASS 3:
         - assumes Pass 2 completed (so all chain courses are assigned)
         - fill remaining unassigned courses ("peas")
-        - fill emptiest modules first
+        - fill emptiest modules first, in sweeps until one places nothing
         - strict phase first, then soft phase
         - celebrity modules allowed
         - no layers conceptually (we pass layer=0 because Module/Course APIs expect it)
 
+        Leftover chain courses can rank best for a module and still not fit
+        it (min_layer > 0, prereqs unplaced or placed too late). By default
+        such a course blocks that module for the sweep, as it always has.
+        With `skip_unplaceable=True` they are passed over so the next best
+        course can take the module; this places more courses on most inputs
+        but changes the schedule, so it is opt-in.
+
         Returns number of courses assigned in Pass 3.
         """
 
-        def teacher_options_count(course, module_num, strict):
-            cnt = 0
-            for teacher_name in course.possible_teachers:
-                teacher = self.teachers.get(teacher_name)
-                if teacher is None:
-                    continue
-                if teacher.is_available_for(course.name, module_num, strict=strict):
-                    cnt += 1
-            return cnt
-
         # all remaining unassigned courses
-        unassigned = [c for c in self.courses.values() if c.module_assigned is None]
+        unassigned = {
+            c.name: c for c in self.courses.values() if c.module_assigned is None
+        }
+
+        # courses that can never sit at layer 0 (min_layer > 0, or a prereq
+        # placed at layer >= 1); when skipping they leave the scans entirely
+        candidates = {
+            name: c for name, c in unassigned.items()
+            if not skip_unplaceable or (c.min_layer == 0 and c._min_abs_slot <= 14)
+        }
 
         assigned_total = 0
 
         # strict first, then soft
         for strict in [True, False]:
 
-            while unassigned:
+            # course_name -> modules with an available teacher; only courses
+            # sharing a just-assigned teacher are invalidated
+            teacher_mask_cache = {}
+
+            # (module, course) pairs whose assign_to_module() failed; skipped
+            # for the rest of the phase instead of being retried every sweep
+            rejected = set()
+
+            while candidates:
                 progress = 0
 
-                # emptiest module first (recomputed each sweep)
-                module_nums = sorted(
-                    self.modules.keys(),
-                    key=lambda m: (self.modules[m].total_count(), m)
-                )
+                # one sweep: every module once, emptiest first. Placing a
+                # course can unlock its successors, so sweeps repeat until one
+                # makes no progress.
+                heap = [(mod.total_count(), mnum) for mnum, mod in self.modules.items()]
+                heapq.heapify(heap)
 
-                for module_num in module_nums:
+                while heap and candidates:
+                    _, module_num = heapq.heappop(heap)
                     mod = self.modules[module_num]
 
-                    # build candidates for this module
-                    candidates = []
-                    for course in unassigned:
+                    # best candidate for this module:
+                    # (teacher options, name, course, fits this module)
+                    module_bit = 1 << (module_num - 1)
+                    best = None
+                    for course in candidates.values():
+
+                        # min_layer and prereqs, as can_be_assigned_to_module()
+                        # checks them; O(1) via the readiness state
+                        fits = (
+                            course.min_layer == 0
+                            and not self._indeg[course.name]
+                            and module_num >= course._min_abs_slot
+                        )
+                        if skip_unplaceable and not fits:
+                            continue
+
+                        if (module_num, course.name) in rejected:
+                            continue
 
                         # module capacity check happens inside can_accept()
                         if not mod.can_accept(course, layer=0):
                             continue
 
                         # teacher availability for this module
-                        if not course.has_teachers_for_module(
-                            module_num, self.teachers, strict=strict
-                        ):
+                        teacher_mask = teacher_mask_cache.get(course.name)
+                        if teacher_mask is None:
+                            teacher_mask = course.available_modules_mask(self.teachers, strict=strict)
+                            teacher_mask_cache[course.name] = teacher_mask
+                        if not teacher_mask & module_bit:
                             continue
 
                         # prefer most constrained for THIS module
-                        opts = teacher_options_count(course, module_num, strict)
-                        candidates.append((opts, course.name, course))
+                        limit = best[0] if best is not None else None
+                        opts = course.count_teachers_for_module(
+                            module_num, self.teachers, strict=strict, limit=limit
+                        )
+
+                        if best is None or (opts, course.name) < best[:2]:
+                            best = (opts, course.name, course, fits)
 
-                    if not candidates:
+                    # nothing to place, or the best course cannot go here
+                    if best is None or not best[3]:
                         continue
 
-                    candidates.sort()
-                    chosen = candidates[0][2]
+                    chosen = best[2]
 
                     ok = chosen.assign_to_module(
                         module_num,
@@ -303,15 +476,20 @@ class Scheduler:
                     )
 
                     if not ok:
-                        # if something changed mid-loop (capacity/teacher), just skip
+                        rejected.add((module_num, chosen.name))
                         continue
 
                     mod.add_course(chosen, layer=0)
+                    self._mark_assigned(chosen, layer=0)
 
-                    unassigned.remove(chosen)
+                    del unassigned[chosen.name]
+                    del candidates[chosen.name]
                     assigned_total += 1
                     progress += 1
 
+                    for name in self._teacher_to_courses[chosen.teacher_assigned]:
+                        teacher_mask_cache.pop(name, None)
+
                 # if we couldn't place anything in a full sweep, stop this phase
                 if progress == 0:
                     break
@@ -325,16 +503,17 @@ class Scheduler:
     # ---------- OUTPUT ----------
 
     def print_modules(self):
-        print("\n=== CURRENT MODULE STATE ===\n")
+        # build the whole report first and write it in one call
+        lines = ["\n=== CURRENT MODULE STATE ===\n"]
 
         for module_number in sorted(self.modules.keys()):
             module = self.modules[module_number]
 
-            print(f"Module {module_number}")
-            print("-" * 40)
+            lines.append(f"Module {module_number}")
+            lines.append("-" * 40)
 
             if not module.courses:
-                print("  (empty)")
+                lines.append("  (empty)")
             else:
                 for course in module.courses:
                     teacher = course.teacher_assigned or "Unassigned"
@@ -343,15 +522,48 @@ class Scheduler:
                     if module.has_celebrity_course and course.teacher_assigned:
                         tag = " [CELEBRITY]" if course.is_celebrity else ""
 
-                    print(f"  {course.name}  |  Teacher: {teacher}{tag}")
+                    lines.append(f"  {course.name}  |  Teacher: {teacher}{tag}")
+
+            lines.append("")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
-            print()
+
+    def _materialize_assignments(self):
+        """Return one Assignment per placed course, shared by the output methods.
+
+        `teacher` is the Teacher object (None if unknown) and `availability`
+        the raw availability value used for the placement (None without a
+        teacher). The list is cached until the next assignment.
+        """
+        if self._assignments is None:
+            assignments = []
+            for course in self.courses.values():
+                if course.module_assigned is None:
+                    continue
+
+                teacher = self.teachers.get(course.teacher_assigned) if course.teacher_assigned else None
+                availability = (
+                    teacher.availability_value(course.module_assigned)
+                    if teacher is not None else None
+                )
+                assignments.append(
+                    Assignment(course, teacher, course.module_assigned, availability)
+                )
+            self._assignments = assignments
+
+        return self._assignments
 
 
     def print_summary(self):
         """
         Quick overview: module loads + soft usage + unassigned.
         """
+        soft_by_module = {}
+        for a in self._materialize_assignments():
+            if a.availability == 0:
+                soft_by_module[a.module] = soft_by_module.get(a.module, 0) + 1
+
         # module load
         print("\n=== SUMMARY ===")
         total_assigned = 0
@@ -362,12 +574,7 @@ class Scheduler:
             count = len(mod.courses)
             total_assigned += count
 
-            soft_here = 0
-            for c in mod.courses:
-                if c.teacher_assigned:
-                    t = self.teachers.get(c.teacher_assigned)
-                    if t and t.availability_value(mnum) == 0:
-                        soft_here += 1
+            soft_here = soft_by_module.get(mnum, 0)
 
             total_soft += soft_here
             celeb = "yes" if mod.has_celebrity_course else "no"
@@ -390,31 +597,22 @@ class Scheduler:
         One row per assigned course.
         Columns: module,course,teacher,needs_confirmation if teacher availability used == 0 (soft constraint)
         """
-        rows = []
-
-        for course in self.courses.values():
-            if course.module_assigned is None:
-                continue
-
-            teacher = self.teachers.get(course.teacher_assigned)
-            avail_val = ""
-            if teacher is not None:
-                avail_val = "" if teacher.availability_value(course.module_assigned) == 1 else "Used 0 availability, needs confirmation"
-
-            rows.append((
-                course.module_assigned,
-                course.name,
-                course.teacher_assigned or "",
-                avail_val
-            ))
+        rows = [
+            (
+                a.module,
+                a.course.name,
+                a.course.teacher_assigned or "",
+                ""
+                if a.teacher is None or a.availability == 1
+                else "Used 0 availability, needs confirmation",
+            )
+            for a in self._materialize_assignments()
+        ]
 
         # stable ordering
         rows.sort(key=lambda r: (r[0], r[1], r[2]))
 
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["module", "course", "teacher", "needs confirmation"])
-            w.writerows(rows)
+        write_csv(filename, ("module", "course", "teacher", "needs confirmation"), rows)
 
 
     def export_soft_violations_csv(self, filename="out_soft_violations.csv"):
@@ -422,27 +620,13 @@ class Scheduler:
         Only rows where teacher_availability == 0.
         Columns: module,course,teacher
         """
-        rows = []
-
-        for course in self.courses.values():
-            if course.module_assigned is None or not course.teacher_assigned:
-                continue
-
-            teacher = self.teachers.get(course.teacher_assigned)
-            if teacher is None:
-                continue
-
-            if teacher.availability_value(course.module_assigned) == 0:
-                rows.append((
-                    course.module_assigned,
-                    course.name,
-                    course.teacher_assigned
-                ))
+        rows = [
+            (a.module, a.course.name, a.course.teacher_assigned)
+            for a in self._materialize_assignments()
+            if a.availability == 0
+        ]
 
         rows.sort(key=lambda r: (r[0], r[1], r[2]))
 
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["module", "course", "teacher"])
-            w.writerows(rows)
+        write_csv(filename, ("module", "course", "teacher"), rows)
 
@@ -1,7 +1,26 @@
-from classes import module
+"""Teacher domain object and availability helpers."""
 
+from array import array
 
-"""Teacher domain object and availability helpers."""
+
+# availability value -> availability_score (lower is better; None = forbidden)
+_SCORE = {1: 0, 0: 1, -1: None}
+
+
+def pack_availability(availability):
+    """Pack 14 availability values into bitmasks in a single pass.
+
+    Returns:
+        tuple[int, int]: (open_mask, declared_mask) where bit (m-1) is set when
+        module m is not forbidden (!= -1), respectively declared (== 1).
+    """
+    open_mask = declared_mask = 0
+    for i, v in enumerate(availability):
+        if v != -1:
+            open_mask |= 1 << i
+            if v == 1:
+                declared_mask |= 1 << i
+    return open_mask, declared_mask
 
 
 class Teacher:
@@ -9,22 +28,35 @@ class Teacher:
 
     Attributes:
         name (str): teacher name
-        can_teach_courses (set[str]): set of course names this teacher can teach
-        availability (list[int]): 14 ints where 1 = preferred, 0 = soft/ok, -1 = forbidden
+        can_teach_courses (frozenset[str]): course names this teacher can teach
+        availability (array[int]): 14 signed bytes ('b') where 1 = preferred, 0 = soft/ok, -1 = forbidden
         capacity_total (int): initial capacity
         capacity_left (int): remaining capacity
         teaches (list[tuple[str,int]]): assigned (course_name, module)
-        assigned_modules (set[int]): modules already taken by this teacher
+        assigned_mask (int): bit (m-1) set when module m is already taken by this teacher
+        open_mask (int): bit (m-1) set when module m is not forbidden (availability != -1)
+        declared_mask (int): bit (m-1) set when module m is declared (availability == 1)
+        score_table (tuple): per-module availability_score (0, 1, or None if forbidden)
     """
+    __slots__ = (
+        "name", "can_teach_courses", "availability", "capacity_total",
+        "capacity_left", "teaches", "assigned_mask",
+        "open_mask", "declared_mask", "score_table",
+    )
+
     def __init__(self, name: str, can_teach_courses, availability, capacity: int):
         self.name = name
-        self.can_teach_courses = set(can_teach_courses)   # course names
-        self.availability = list(availability)            # 14 ints: 1/0/-1 (declared)
+        self.can_teach_courses = frozenset(can_teach_courses)   # course names
+        self.availability = array("b", availability)      # 14 x int8: 1/0/-1 (declared)
         self.capacity_total = int(capacity)
         self.capacity_left = int(capacity)
 
         self.teaches = []              # list of (course_name, module)
-        self.assigned_modules = set()  # modules already taken (1..14)
+        self.assigned_mask = 0         # modules already taken (bit m-1 <-> module m)
+
+        # availability as 14-bit masks (bit m-1 <-> module m), static once loaded
+        self.open_mask, self.declared_mask = pack_availability(self.availability)
+        self.score_table = tuple(map(_SCORE.get, self.availability))
 
 
     def is_available_for(self, course_name: str, module: int, strict: bool = False) -> bool:
@@ -35,17 +67,29 @@ class Teacher:
             module (int): module number (1..14)
             strict (bool): when True, treat availability==0 as unavailable
         """
+        bit = 1 << (module - 1)
         if self.capacity_left < 1:
             return False
-        if module in self.assigned_modules:
+        if self.assigned_mask & bit:
             return False
-        if self.availability[module - 1] == -1:  # if forbidden
-            return False
-        if strict and self.availability[module - 1] == 0:  # if not declared and strict mode
+        # forbidden, or not declared while in strict mode
+        if not (self.declared_mask if strict else self.open_mask) & bit:
             return False
         if course_name not in self.can_teach_courses:
             return False
         return True
+
+
+    def available_modules_mask(self, course_name: str, strict: bool = False) -> int:
+        """Return a 14-bit mask of the modules where `is_available_for` holds.
+
+        Bit (m-1) is set when this teacher can currently teach `course_name`
+        in module m.
+        """
+        if self.capacity_left < 1 or course_name not in self.can_teach_courses:
+            return 0
+        mask = self.declared_mask if strict else self.open_mask
+        return mask & ~self.assigned_mask
     
 
     def availability_score(self, module):
@@ -53,11 +97,7 @@ class Teacher:
 
         Returns 0 for declared availability (1), 1 for soft availability (0).
         """
-        val = self.availability[module - 1]
-        if val == 1:
-            return 0
-        if val == 0:
-            return 1
+        return self.score_table[module - 1]
 
 
     def assign_to(self, course_name: str, module: int) -> bool:
@@ -68,11 +108,17 @@ class Teacher:
         if not self.is_available_for(course_name, module):
             return False
         self.teaches.append((course_name, module))
-        self.assigned_modules.add(module)
+        self.assigned_mask |= 1 << (module - 1)
         self.capacity_left -= 1
         return True
 
 
+    @property
+    def assigned_modules(self):
+        """Decoded view of `assigned_mask`: set of module numbers already taken."""
+        return {m for m in range(1, 15) if self.assigned_mask & (1 << (m - 1))}
+
+
     def availability_value(self, module):
         """Return the raw availability int for the module (1/0/-1)."""
         return self.availability[module - 1]
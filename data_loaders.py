@@ -4,45 +4,67 @@ This module centralises reading CSV inputs and constructing domain objects
 (`Teacher`, `Course`, `Module`) so `main.py` can remain a thin orchestration
 layer. File-path constants live here by default but the functions can be
 adapted to accept paths as parameters for testing.
+
+Course and teacher names are interned (`sys.intern`) as they are read, so
+every dict key, set member and row field shares one string object.
 """
 
 import csv
+import logging
+from collections import defaultdict
+from itertools import islice
+from operator import itemgetter
+from sys import intern
 
 from classes import Teacher, Course, Module
 
 
+log = logging.getLogger(__name__)
+
 # Paths to CSV input files used by the script.
 TEACHER_AVAIL_FILE = "csvs/teacher_availability_2025.csv"
 PREREQS_FILE = "csvs/prereqs_CSDS.csv"
 COURSE_TEACHER_FILE = "csvs/course_teacher_2025.csv"
 CELEBRITY_FILE = "csvs/celebrity_courses.csv"
 
+# Availability column names M1..M14, in module order.
+M_KEYS = tuple(f"M{i}" for i in range(1, 15))
 
+# Shared, immutable defaults for teachers missing from the availability file;
+# Teacher copies availability into its own array and keeps a frozenset as is.
+_EMPTY_FROZEN = frozenset()
+_MISSING_AVAIL = (-1,) * len(M_KEYS)
 
-def load_teacher_availability():
-    """Parse the teacher availability CSV and return metadata per teacher.
 
-    Returns:
-        dict[str, dict]: mapping teacher name -> {"availability": list[int], "capacity": int}
-    """
-    teachers_data = {}
 
+def iter_teacher_availability():
+    """Stream the teacher availability CSV one teacher at a time.
+
+    Yields:
+        tuple[str, list[int], int]: (name, availability for M1..M14, capacity)
+    """
     with open(TEACHER_AVAIL_FILE, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
 
-        for row in reader:
-            name = row["name"].strip()
+        # resolve column positions once from the header; empty file -> no rows
+        header = next(reader, None)
+        if header is None:
+            return
+        idx_name = header.index("name")
+        idx_capacity = header.index("capacity")
+        get_modules = itemgetter(*(header.index(k) for k in M_KEYS))
 
-            # Parse module availability columns M1..M14 into integers
-            availability = [int(row[f"M{i}"]) for i in range(1, 15)]
-            capacity = int(row["capacity"])
+        for row in reader:
+            if not row:
+                continue
+            name = intern(row[idx_name].strip())
 
-            teachers_data[name] = {
-                "availability": availability,
-                "capacity": capacity,
-            }
+            # Parse module availability columns M1..M14 into integers; the
+            # column pick and int conversion both run in C
+            availability = list(map(int, get_modules(row)))
+            capacity = int(row[idx_capacity])
 
-    return teachers_data
+            yield name, availability, capacity
 
 
 def load_course_teacher_rows():
@@ -59,67 +81,122 @@ def load_course_teacher_rows():
         for row in reader:
             if not row:
                 continue
-            course_name = row[0].strip()
-            teacher_names = [t.strip() for t in row[1:] if t.strip()]
+            course_name = intern(row[0].strip())
+            teacher_names = [intern(t.strip()) for t in row[1:] if t.strip()]
             rows.append((course_name, teacher_names))
     return rows
 
 
-def build_teachers():
-    """Build `Teacher` objects from availability and course->teacher mapping.
+def _missing_teacher(name):
+    """Placeholder Teacher for a name seen in course_teacher.csv only."""
+    return Teacher(
+        name=name,
+        can_teach_courses=_EMPTY_FROZEN,
+        availability=_MISSING_AVAIL,
+        capacity=0
+    )
+
+
+def _invert_course_teacher(course_teacher_rows):
+    """Invert course_teacher rows into teacher->courses, without building Courses.
 
     Returns:
-        dict[str, Teacher]: mapping teacher name -> Teacher instance
+        dict[str, set[str]]: teacher name -> course names, in first-seen order
+    """
+    teacher_to_courses = defaultdict(set)
+    for course_name, teacher_names in course_teacher_rows:
+        for t in teacher_names:
+            teacher_to_courses[t].add(course_name)
+    return teacher_to_courses
+
+
+def _index_course_teacher(course_teacher_rows):
+    """Walk course_teacher rows once into Course objects and teacher->courses.
+
+    Returns:
+        tuple[dict[str, Course], dict[str, set[str]]]: (courses, teacher_to_courses);
+        teacher_to_courses keeps the order in which teachers are first seen.
     """
-    teacher_availability = load_teacher_availability()
+    courses = {}
+    teacher_to_courses = defaultdict(set)
+    for course_name, teacher_names in course_teacher_rows:
+        course = courses.get(course_name)
+        if course is None:
+            course = Course(course_name)
+            courses[course_name] = course
 
-    # Invert course->teachers into teacher->courses for quick lookup when creating
-    # Teacher objects.
-    teacher_to_courses = {}
-    for course_name, teacher_names in load_course_teacher_rows():
+        course.possible_teachers.update(teacher_names)
         for t in teacher_names:
-            teacher_to_courses.setdefault(t, set()).add(course_name)
+            teacher_to_courses[t].add(course_name)
 
+    return courses, teacher_to_courses
+
+
+def _teachers_from_availability(availability_rows, teacher_to_courses):
+    """Build each Teacher straight from its availability row (no intermediate dict)."""
     teachers = {}
-    for name, data in teacher_availability.items():
-        can_teach_courses = teacher_to_courses.get(name, set())
+    for name, availability, capacity in availability_rows:
+        # frozen here so Teacher keeps this object instead of copying it
+        can_teach_courses = frozenset(teacher_to_courses.get(name, ()))
 
         teachers[name] = Teacher(
             name=name,
             can_teach_courses=can_teach_courses,
-            availability=data["availability"],
-            capacity=data["capacity"],
+            availability=availability,
+            capacity=capacity,
         )
-
     return teachers
 
 
-def build_courses_from_course_teacher(teachers):
-    """Create Course objects from `course_teacher.csv` and populate teachers."""
-    courses = {}
+def _add_missing_teachers(teachers, teacher_to_courses):
+    """Add placeholders for teachers listed for a course but absent from `teachers`."""
+    for t in teacher_to_courses:
+        if t not in teachers:
+            teachers[t] = _missing_teacher(t)
 
-    for course_name, teacher_names in load_course_teacher_rows():
-        course = courses.get(course_name)
-        if course is None:
-            course = Course(course_name)
-            courses[course_name] = course
 
-        # attach teacher names (ensure teacher exists)
-        for t in teacher_names:
-            if t not in teachers:
-                teachers[t] = Teacher(
-                    name=t,
-                    can_teach_courses=set(),
-                    availability=[-1]*14,
-                    capacity=0
-                )
-            course.possible_teachers.add(t)
+def build_teachers(course_teacher_rows=None, availability_rows=None):
+    """Build `Teacher` objects from availability and course->teacher mapping.
+
+    Args:
+        course_teacher_rows (list|None): rows from `load_course_teacher_rows()`;
+            read from disk when omitted. Pass them in to parse the CSV only once.
+        availability_rows (iterable|None): (name, availability, capacity) rows
+            as yielded by `iter_teacher_availability()`; streamed from disk
+            when omitted.
+
+    Returns:
+        dict[str, Teacher]: mapping teacher name -> Teacher instance
+    """
+    if course_teacher_rows is None:
+        course_teacher_rows = load_course_teacher_rows()
+    if availability_rows is None:
+        availability_rows = iter_teacher_availability()
+
+    teacher_to_courses = _invert_course_teacher(course_teacher_rows)
+    return _teachers_from_availability(availability_rows, teacher_to_courses)
+
 
+def build_courses_from_course_teacher(teachers, course_teacher_rows=None):
+    """Create Course objects from `course_teacher.csv` and populate teachers.
+
+    Teachers missing from `teachers` are added as zero-capacity placeholders.
+    """
+    if course_teacher_rows is None:
+        course_teacher_rows = load_course_teacher_rows()
+
+    courses, teacher_to_courses = _index_course_teacher(course_teacher_rows)
+    _add_missing_teachers(teachers, teacher_to_courses)
     return courses
 
 
-def load_prereqs_into_courses(courses):
-    """Load prerequisite relationships from `prereqs_CSDS.csv` into `courses`."""
+def load_prereq_rows():
+    """Read `prereqs_CSDS.csv` and return (course, min_layer, [prereqs...]) rows.
+
+    Returns:
+        list[tuple[str, int, list[str]]]: list of (course_name, min_layer, prereq_names)
+    """
+    rows = []
     with open(PREREQS_FILE, newline="", encoding="utf-8") as f:
         reader = csv.reader(f)
 
@@ -127,73 +204,127 @@ def load_prereqs_into_courses(courses):
             if not row:
                 continue
 
-            course_name = row[0].strip()
+            course_name = intern(row[0].strip())
             min_layer = int(row[1].strip()) if row[1].strip() else 0
-            prereq_names = [c.strip() for c in row[2:] if c.strip()]
+            prereq_names = [intern(c.strip()) for c in row[2:] if c.strip()]
+            rows.append((course_name, min_layer, prereq_names))
+    return rows
 
-            if course_name not in courses:
-                raise KeyError(
-                    f"prereqs_CSDS.csv course '{course_name}' not found in course_teacher.csv"
-                )
 
-            course = courses[course_name]
-            course.min_layer = min_layer
-            course.prereqs.update(prereq_names)
-            course.part_of_chain = True
+def load_prereqs_into_courses(courses, prereq_rows=None):
+    """Load prerequisite relationships from `prereqs_CSDS.csv` into `courses`.
 
-            for prereq in prereq_names:
-                if prereq not in courses:
-                    raise KeyError(
-                        f"prereqs_CSDS.csv prereq '{prereq}' not found in course_teacher.csv"
-                    )
+    `prereq_rows` are rows from `load_prereq_rows()`; read from disk when omitted.
+    """
+    if prereq_rows is None:
+        prereq_rows = load_prereq_rows()
+
+    for course_name, min_layer, prereq_names in prereq_rows:
+        if course_name not in courses:
+            raise KeyError(
+                f"prereqs_CSDS.csv course '{course_name}' not found in course_teacher.csv"
+            )
+
+        # one set difference instead of a lookup per prereq; checked
+        # before the course is touched so a bad row leaves no partial state
+        prereq_set = set(prereq_names)
+        missing = prereq_set - courses.keys()
+        if missing:
+            raise KeyError(
+                f"prereqs_CSDS.csv prereqs {sorted(missing)} for '{course_name}' "
+                f"not found in course_teacher.csv"
+            )
+
+        course = courses[course_name]
+        course.min_layer = min_layer
+        course.prereqs.update(prereq_set)
+        course.part_of_chain = True
+
+
+def build_courses(teachers, course_teacher_rows=None, prereq_rows=None):
+    courses = build_courses_from_course_teacher(teachers, course_teacher_rows)
+    load_prereqs_into_courses(courses, prereq_rows)
+    return courses
 
 
-def build_courses(teachers):
-    courses = build_courses_from_course_teacher(teachers)
-    load_prereqs_into_courses(courses)
-    return courses
+def build_world(course_teacher_rows=None, availability_rows=None, prereq_rows=None):
+    """Build teachers and courses together from a single course_teacher pass.
+
+    Equivalent to `build_teachers()` followed by `build_courses()`, but the
+    course_teacher rows are walked once: each row both fills the
+    teacher->courses map and creates/populates its `Course`. Arguments are
+    the same pre-read rows those functions accept; each is read from disk
+    when omitted.
+
+    Returns:
+        tuple[dict[str, Teacher], dict[str, Course]]: (teachers, courses)
+    """
+    if course_teacher_rows is None:
+        course_teacher_rows = load_course_teacher_rows()
+    if availability_rows is None:
+        availability_rows = iter_teacher_availability()
+
+    courses, teacher_to_courses = _index_course_teacher(course_teacher_rows)
+    teachers = _teachers_from_availability(availability_rows, teacher_to_courses)
+    _add_missing_teachers(teachers, teacher_to_courses)
+
+    load_prereqs_into_courses(courses, prereq_rows)
+    return teachers, courses
 
 
 def load_celebrity_courses():
     """Parse celebrity courses CSV and return list of (course, module, teacher)."""
     celebrity_courses = []
     with open(CELEBRITY_FILE, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+
+        header = next(reader, None)
+        if header is None:
+            return celebrity_courses
+        idx_course = header.index("course_name")
+        idx_module = header.index("module")
+        idx_teacher = header.index("teacher")
+
         for row in reader:
-            course_name = row["course_name"].strip()
-            module_num = int(row["module"])
-            teacher_name = row["teacher"].strip()
+            if not row:
+                continue
+            course_name = intern(row[idx_course].strip())
+            module_num = int(row[idx_module])
+            teacher_name = intern(row[idx_teacher].strip())
             celebrity_courses.append((course_name, module_num, teacher_name))
     return celebrity_courses
 
 
 def build_modules(total_modules=14, max_capacity=9):
     """Create Module objects for module indices 1..total_modules."""
-    modules = {}
+    return {
+        i: Module(number=i, max_capacity=max_capacity)
+        for i in range(1, total_modules + 1)
+    }
 
-    for i in range(1, total_modules + 1):
-        modules[i] = Module(number=i, max_capacity=max_capacity)
 
-    return modules
+def debug_state(teachers, courses, modules):
+    """Log a compact debug summary of loaded domain objects at DEBUG level.
 
+    Returns immediately when DEBUG logging is off, so no object reprs are built.
+    """
+    if not log.isEnabledFor(logging.DEBUG):
+        return
 
-def debug_state(teachers, courses, modules):
-    """Print a compact debug summary of loaded domain objects."""
-    print(f"Loaded {len(teachers)} teachers")
-    print(f"Loaded {len(courses)} courses")
-    print(f"Loaded {len(modules)} modules")
+    log.debug("Loaded %d teachers", len(teachers))
+    log.debug("Loaded %d courses", len(courses))
+    log.debug("Loaded %d modules", len(modules))
 
-    chain_courses = [c for c in courses.values() if c.part_of_chain]
-    print(f"Chain courses: {len(chain_courses)}")
+    log.debug("Chain courses: %d", sum(1 for c in courses.values() if c.part_of_chain))
 
-    print("\n--- sample courses ---")
-    for c in list(courses.values())[:5]:
-        print(c)
+    log.debug("\n--- sample courses ---")
+    for c in islice(courses.values(), 5):
+        log.debug("%s", c)
 
-    print("\n--- sample teachers ---")
-    for t in list(teachers.values())[:5]:
-        print(t)
+    log.debug("\n--- sample teachers ---")
+    for t in islice(teachers.values(), 5):
+        log.debug("%s", t)
 
-    print("\n--- sample modules ---")
-    for m in list(modules.values())[:5]:
-        print(m)
+    log.debug("\n--- sample modules ---")
+    for m in islice(modules.values(), 5):
+        log.debug("%s", m)
@@ -12,11 +12,17 @@ Expected CSV formats (brief):
 - `celebrity_courses.csv`: columns "course_name","module","teacher"
 """
 
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 from classes import Scheduler
 
 from data_loaders import (
-    build_teachers,
-    build_courses,
+    iter_teacher_availability,
+    load_course_teacher_rows,
+    load_prereq_rows,
+    build_world,
     build_modules,
     load_celebrity_courses,
     debug_state,
@@ -26,6 +32,8 @@ from reports import write_zero_capacity_teachers_report
 
 DEBUG = False
 
+log = logging.getLogger(__name__)
+
 
 # ---------- MAIN ----------
 def main():
@@ -42,27 +50,42 @@ def main():
     Side effects:
         - Writes `out_schedule.csv` and `out_soft_violations.csv` to cwd.
     """
-    teachers = build_teachers()
-    courses = build_courses(teachers)
+    # progress messages go through logging; DEBUG also enables the state dump
+    logging.basicConfig(
+        level=logging.DEBUG if DEBUG else logging.INFO,
+        format="%(message)s",
+        stream=sys.stdout,
+    )
+
+    # The four input CSVs are independent, so read them concurrently.
+    # course_teacher.csv is parsed once and walked once for teachers and courses.
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        f_avail = ex.submit(lambda: list(iter_teacher_availability()))
+        f_course_teacher = ex.submit(load_course_teacher_rows)
+        f_prereqs = ex.submit(load_prereq_rows)
+        f_celebrity = ex.submit(load_celebrity_courses)
+
+        teachers, courses = build_world(
+            f_course_teacher.result(), f_avail.result(), f_prereqs.result()
+        )
+        celebrity_courses = f_celebrity.result()
     modules = build_modules()
 
     scheduler = Scheduler(teachers, courses, modules)
 
-    # Helpful development-only dump when debugging is enabled
-    if DEBUG:
-        debug_state(teachers, courses, modules)
+    # Helpful development-only dump (no-op unless DEBUG logging is enabled)
+    debug_state(teachers, courses, modules)
 
     # Pass 1: place celebrity courses (fixed module+teacher assignments)
-    celebrity_courses = load_celebrity_courses()
     scheduler.pass1_celebrity(celebrity_courses)
 
     # Pass 2: schedule chained/prerequisite courses
     assigned_chain = scheduler.pass2_chains()
-    print(f"\nAssigned {assigned_chain} chain courses.")
+    log.info("\nAssigned %d chain courses.", assigned_chain)
 
     # Pass 3: schedule remaining solitary courses
     assigned_solitary = scheduler.pass3_solitary()
-    print(f"Assigned {assigned_solitary} solitary courses")
+    log.info("Assigned %d solitary courses", assigned_solitary)
 
     # Print result and export CSVs
     scheduler.print_modules()
@@ -78,10 +101,10 @@ def main():
         filepath="csvs/out_teachers_capacity_zero.csv"
     )
 
-    print(
+    log.info(
         "\nWrote out_schedule.csv, "
         "out_soft_violations.csv, "
-        "and out_teachers_capacity_zero.csv"
+        "and out_teachers_capacity_zero.csv "
         "to the csvs/ directory."
     )
 
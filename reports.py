@@ -1,4 +1,6 @@
-import csv
+from collections import defaultdict
+
+from classes.csv_utils import write_csv
 
 
 def write_zero_capacity_teachers_report(
@@ -13,27 +15,24 @@ def write_zero_capacity_teachers_report(
       teacher, occurrences, course1, course2, ...
     """
 
-    rows = []
-
-    for teacher_name, teacher in teachers.items():
-        if teacher.capacity_total != 0:
-            continue
-
-        matching_courses = []
-
-        for course_name, course in courses.items():
-            if teacher_name in course.possible_teachers:
-                matching_courses.append(course_name)
-
-        if matching_courses:
-            matching_courses.sort()
-            rows.append((teacher_name, matching_courses))
-
-    rows.sort(key=lambda x: x[0].lower())
-
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["teacher", "occurrences", "courses..."])
-
-        for teacher_name, course_list in rows:
-            writer.writerow([teacher_name, len(course_list), *course_list])
+    # invert course -> teachers once instead of scanning courses per teacher
+    teacher_to_courses = defaultdict(list)
+    for course_name, course in courses.items():
+        for teacher_name in course.possible_teachers:
+            teacher_to_courses[teacher_name].append(course_name)
+
+    # only lists that are actually emitted get sorted
+    rows = sorted(
+        (
+            (teacher_name, sorted(teacher_to_courses[teacher_name]))
+            for teacher_name, teacher in teachers.items()
+            if teacher.capacity_total == 0 and teacher_name in teacher_to_courses
+        ),
+        key=lambda x: x[0].lower(),
+    )
+
+    write_csv(
+        filepath,
+        ("teacher", "occurrences", "courses..."),
+        ((teacher_name, len(course_list), *course_list) for teacher_name, course_list in rows),
+    )